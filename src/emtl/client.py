@@ -1,27 +1,80 @@
-import json
+"""EMT client implementation.
+
+The captcha OCR model (ddddocr / ONNX Runtime) is imported and loaded on the
+first login only, so processes that reuse cached sessions never pay for it.
+"""
+
 import os
-import re
+import threading
+import time
+from functools import lru_cache
+from importlib.resources import files
 from random import SystemRandom
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Optional
 
-from ddddocr import DdddOcr
+from requests import RequestException
 from requests import Response
 from requests import Session
-from requests import get
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .const import _base_headers
+from .const import _login_headers
 from .const import _urls
+from .const import _xhr_headers
 from .error import EmAPIError
+from .error import EmtlException
 from .error import LoginFailedError
 from .error import SessionExpiredError
-from .utils import emt_trade_encrypt
+from .utils import _encrypt_cached
 from .utils import get_float
 from .utils import get_logger
+from .utils import json_loads
+
+if TYPE_CHECKING:
+    from ddddocr import DdddOcr
 
 logger = get_logger(__name__)
 
-# Global OCR instance shared by all clients
-_global_ocr = DdddOcr(show_ad=False)
+_VALIDATE_KEY_MARKER = 'id="em_validatekey" type="hidden" value="'
+
+_ABBRS_RESOURCE = files(__package__).joinpath("abbrs.json")
+
+# 1x1 grayscale PNG used to warm up the OCR model
+_WARMUP_PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x00\x00\x00\x00:~\x9bU"
+    b"\x00\x00\x00\nIDATx\x9cc\xf8\x0f\x00\x01\x01\x01\x00\xb18\xf6\x14\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+# Global OCR instance shared by all clients, created on first use
+_global_ocr: Optional["DdddOcr"] = None
+# The underlying ONNX session is not safe for concurrent classification calls
+_ocr_lock = threading.Lock()
+
+
+def _get_ocr() -> "DdddOcr":
+    """Return the shared OCR instance, creating and warming it up on first use.
+
+    Must be called with _ocr_lock held.
+    """
+    global _global_ocr
+    if _global_ocr is None:
+        from ddddocr import DdddOcr  # noqa: PLC0415 - deferred so cached sessions never load ONNX Runtime
+
+        ocr = DdddOcr(show_ad=False)
+        # The first inference pays for ONNX runtime graph setup; do it here
+        # instead of on the first real captcha.
+        ocr.classification(_WARMUP_PNG)
+        _global_ocr = ocr
+    return _global_ocr
+
+
+@lru_cache(maxsize=1)
+def _abbrs_bytes() -> bytes:
+    """Read and cache the raw contents of abbrs.json."""
+    return _ABBRS_RESOURCE.read_bytes()
 
 
 class EMTClient:
@@ -32,16 +85,77 @@ class EMTClient:
     """
 
     def __init__(self) -> None:
-        self.session = Session()
+        self.session = self._new_session()
         self._em_validate_key = ""
+        # Full request URLs (base URL + validate key), rebuilt whenever the key changes
+        self._resolved_urls: dict[str, str] = {}
         self.username: str = ""
+        # time.monotonic() of the last successful login or verify_session; not persisted
+        self._last_verified_at = 0.0
+        # Serializes logins so threads sharing this client re-login only once
+        self._login_lock = threading.Lock()
+
+    @staticmethod
+    def _new_session() -> Session:
+        """Create an HTTP session with the connection pool and base headers applied."""
+        session = Session()
+        # Larger keep-alive pool shared by all hosts; only idempotent GETs are retried
+        # so orders and logins are never resubmitted behind the caller's back.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        # Base headers live on the session so requests only pass the per-call delta
+        session.headers.update(_base_headers)
+        return session
+
+    def __getstate__(self) -> dict:
+        # Only persist what cannot be rebuilt: the identity, validate key and cookies
+        return {
+            "username": self.username,
+            "validate_key": self._em_validate_key,
+            "cookies": self.session.cookies,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        if "session" in state:
+            # Legacy caches pickled the whole instance dict
+            state = {
+                "username": state.get("username", ""),
+                "validate_key": state.get("_em_validate_key", ""),
+                "cookies": state["session"].cookies,
+            }
+        self.session = self._new_session()
+        self.session.cookies = state["cookies"]
+        self.username = state["username"]
+        self._last_verified_at = 0.0
+        self._login_lock = threading.Lock()
+        self._set_validate_key(state["validate_key"])
+
+    def _set_validate_key(self, validate_key: str) -> None:
+        """Store the validation key and rebuild the resolved URL table.
+
+        Clearing the key also clears the verification time, so a client whose
+        session is known to be gone is never treated as freshly verified.
+        """
+        self._em_validate_key = validate_key
+        if not validate_key:
+            self._last_verified_at = 0.0
+        self._resolved_urls = {tag: base_url + validate_key for tag, base_url in _urls.items()} if validate_key else {}
 
     def _query_snapshot(self, symbol_code: str, market: str) -> Optional[dict]:
         url = "https://emhsmarketwg.eastmoneysec.com/api/SHSZQuoteSnapshot"
         params = {"id": symbol_code.strip(), "market": market}
-        resp = self.session.get(url, params=params, headers=_base_headers.copy())
-        self._check_resp(resp)
-        return resp.json()
+        resp = self.session.get(url, params=params)
+        return self._check_resp(resp)
 
     def get_last_price(self, symbol_code: str, market: str) -> float:
         ret = self._query_snapshot(symbol_code, market)
@@ -50,40 +164,43 @@ class EMTClient:
         return get_float(ret["realtimequote"], "currentPrice")
 
     @staticmethod
-    def _check_resp(resp: Response) -> None:
+    def _check_resp(resp: Response) -> Any:
         """Check HTTP response for errors.
 
+        The body is decoded at most once here so callers can reuse the result
+        instead of calling ``resp.json()`` again.
+
         Args:
             resp: Response object to check
 
+        Returns:
+            The decoded JSON body, or None if the body is not JSON
+
         Raises:
             EmAPIError: If response indicates an error
         """
         content_type = resp.headers.get("Content-Type", "")
-        is_image = "image" in content_type
-
-        try:
-            json_resp = resp.json()
-        except:
-            json_resp = None
-
-        is_json = False
-        if json_resp:
-            try:
-                json.dumps(json_resp)
-                is_json = True
-            except:
-                ...
-
-        if is_image:
-            return
+        if "image" in content_type:
+            return None
 
         if resp.status_code != 200:
             logger.error(f"request {resp.url} fail, code={resp.status_code}, response={resp.text}")
             raise EmAPIError(f"HTTP error: {resp.status_code}", status_code=resp.status_code, response=resp.text)
 
-        if is_json:
-            status = (json_resp or {}).get("Status")
+        # Only decode bodies that are labelled or look like JSON, so HTML and
+        # plain-text responses are not run through a parse that is bound to fail.
+        body = resp.content
+        if "json" not in content_type and body.lstrip()[:1] not in (b"{", b"["):
+            return None
+
+        try:
+            json_resp = json_loads(body)
+        except ValueError as e:
+            logger.warning(f"request {resp.url} returned undecodable JSON ({e}), response={resp.text}")
+            return None
+
+        if isinstance(json_resp, dict):
+            status = json_resp.get("Status")
             if status == -2:
                 logger.warning(f"session expired: {resp.text}")
                 raise SessionExpiredError("Session expired, please login again")
@@ -91,7 +208,17 @@ class EMTClient:
                 logger.error(f"request {resp.url} fail, code={resp.status_code}, response={resp.text}")
                 raise EmAPIError(f"API error: {resp.text}", status_code=resp.status_code, response=resp.text)
 
-    def _query_something(self, tag: str, req_data: Optional[dict] = None) -> Optional[Response]:
+        return json_resp
+
+    def _ensure_login(self) -> None:
+        """Log in if the client holds no validation key yet."""
+        if not self._em_validate_key:
+            with self._login_lock:
+                # Another thread may have logged in while we were waiting
+                if not self._em_validate_key:
+                    self.login()
+
+    def _query_something(self, tag: str, req_data: Optional[dict] = None) -> tuple[Response, Any]:
         """Generic query function for EMT API.
 
         Args:
@@ -99,18 +226,14 @@ class EMTClient:
             req_data: Optional request payload data
 
         Returns:
-            Response object or None if request fails
+            Tuple of (response, decoded JSON body or None)
 
         Raises:
-            AssertionError: If tag is not in _urls
+            KeyError: If tag is not in _urls
         """
-        if not self._em_validate_key:
-            validate_key = self.login()
-        else:
-            validate_key = self._em_validate_key
+        self._ensure_login()
 
-        assert tag in _urls, f"{tag} not in url list"
-        url = _urls[tag] + validate_key
+        url = self._resolved_urls[tag]
 
         if req_data is None:
             req_data = {
@@ -118,15 +241,12 @@ class EMTClient:
                 "dwc": "",
             }
 
-        headers = _base_headers.copy()
-        headers["X-Requested-With"] = "XMLHttpRequest"
         logger.debug(f"(tag={tag}), (data={req_data}), (url={url})")
 
-        resp = self.session.post(url, headers=headers, data=req_data)
-        self._check_resp(resp)
-        return resp
+        resp = self.session.post(url, headers=_xhr_headers, data=req_data)
+        return resp, self._check_resp(resp)
 
-    def _query_something_with_retry(self, tag: str, req_data: Optional[dict] = None) -> Optional[Response]:
+    def _query_something_with_retry(self, tag: str, req_data: Optional[dict] = None) -> tuple[Response, Any]:
         """Generic query function with automatic retry on session expiration.
 
         Args:
@@ -134,31 +254,65 @@ class EMTClient:
             req_data: Optional request payload data
 
         Returns:
-            Response object or None if request fails
+            Tuple of (response, decoded JSON body or None)
 
         Raises:
-            AssertionError: If tag is not in _urls
+            KeyError: If tag is not in _urls
             LoginFailedError: If re-login fails
         """
+        # Log in first so stale_key is the key the request is actually sent with
+        self._ensure_login()
+        stale_key = self._em_validate_key
         try:
             return self._query_something(tag, req_data)
         except SessionExpiredError:
             # Session expired, clear cache and re-login
-            self._re_login()
+            self._re_login(stale_key)
             # Retry the request once
             return self._query_something(tag, req_data)
 
-    def _get_captcha_code(self) -> tuple[float, str]:
-        """Get random number and captcha code.
+    def _query_json(self, tag: str, req_data: Optional[dict] = None) -> Any:
+        """Query the EMT API and return the decoded JSON body.
+
+        Args:
+            tag: Request type identifier
+            req_data: Optional request payload data
 
         Returns:
-            Tuple of (random_number, captcha_code)
+            Decoded JSON body or None if the response is not JSON
+
+        Raises:
+            KeyError: If tag is not in _urls
+            LoginFailedError: If re-login fails
+        """
+        _, data = self._query_something_with_retry(tag, req_data)
+        return data
+
+    def fetch_captcha(self) -> tuple[float, bytes]:
+        """Fetch a captcha image on this client's session.
+
+        The image is bound to both the random number and the session cookies,
+        so the solved code must be passed back to login on the same client as
+        ``captcha=(random_number, code)``.
+
+        Returns:
+            Tuple of (random_number, image_bytes)
         """
         cryptogen = SystemRandom()
         random_num = cryptogen.random()
-        resp = get(f"{_urls['yzm']}{random_num}", headers=_base_headers, timeout=60)
+        resp = self.session.get(f"{_urls['yzm']}{random_num}", timeout=10)
         self._check_resp(resp)
-        code = _global_ocr.classification(resp.content)
+        return random_num, resp.content
+
+    def _get_captcha_code(self) -> tuple[float, str]:
+        """Get random number and captcha code.
+
+        Returns:
+            Tuple of (random_number, captcha_code)
+        """
+        random_num, image = self.fetch_captcha()
+        with _ocr_lock:
+            code = _get_ocr().classification(image)
         return random_num, code
 
     def _get_em_validate_key(self) -> Optional[str]:
@@ -168,23 +322,35 @@ class EMTClient:
             The validation key string or None if not found
         """
         url = "https://jywg.18.cn/Trade/Buy"
-        resp = self.session.get(url, headers=_base_headers)
+        resp = self.session.get(url)
         self._check_resp(resp)
-        match_result = re.findall(r'id="em_validatekey" type="hidden" value="(.*?)"', resp.text)
-        if match_result:
-            _em_validatekey = match_result[0].strip()
+        text = resp.text
+        start = text.find(_VALIDATE_KEY_MARKER)
+        if start >= 0:
+            start += len(_VALIDATE_KEY_MARKER)
+            end = text.find('"', start)
+            _em_validatekey = text[start:end].strip() if end >= 0 else ""
             if _em_validatekey:
-                self._em_validate_key = _em_validatekey
+                self._set_validate_key(_em_validatekey)
                 return _em_validatekey
         return None
 
-    def login(self, username: str = "", password: str = "", duration: int = 180) -> Optional[str]:
+    def login(
+        self,
+        username: str = "",
+        password: str = "",
+        duration: int = 180,
+        captcha: Optional[tuple[float, str]] = None,
+    ) -> Optional[str]:
         """Login to EMT trading platform.
 
         Args:
             username: EMT username (defaults to EM_USERNAME env var)
             password: EMT password in plaintext (defaults to EM_PASSWORD env var)
             duration: Session duration in minutes, defaults to 180
+            captcha: Optional pre-solved (random_number, captcha_code) pair for an
+                image obtained with fetch_captcha on this client. When given, the
+                captcha fetch and OCR step are skipped.
 
         Returns:
             Validation key string if login succeeds, None otherwise
@@ -197,16 +363,12 @@ class EMTClient:
         # Store username for serialization
         self.username = username.strip()
 
-        random_num, code = self._get_captcha_code()
-        headers = _base_headers.copy()
-        headers["X-Requested-With"] = "XMLHttpRequest"
-        headers["Referer"] = "https://jywg.18.cn/Login?el=1&clear=&returl=%2fTrade%2fBuy"
-        headers["Content-Type"] = "application/x-www-form-urlencoded"
+        random_num, code = captcha if captcha is not None else self._get_captcha_code()
 
         url = _urls["login"]
         data = {
             "userId": username.strip(),
-            "password": emt_trade_encrypt(password.strip()),
+            "password": _encrypt_cached(password.strip()),
             "randNumber": random_num,
             "identifyCode": code,
             "duration": duration,
@@ -215,11 +377,11 @@ class EMTClient:
             "secInfo": "",
         }
 
-        resp = self.session.post(url, headers=headers, data=data)
-        self._check_resp(resp)
+        resp = self.session.post(url, headers=_login_headers, data=data)
+        login_result = self._check_resp(resp)
 
         try:
-            logger.info(f"login success for {resp.json()}")
+            logger.info(f"login success for {login_result}")
             validate_key = self._get_em_validate_key()
         except KeyError as e:
             logger.error(f"param data found exception:[{e}], [data={resp}]")
@@ -228,12 +390,19 @@ class EMTClient:
         # Check if login succeeded
         if validate_key is None:
             raise LoginFailedError(f"Login failed for user '{username}'. Please check username, password, and captcha.")
+        self._last_verified_at = time.monotonic()
         return validate_key
 
-    def _re_login(self) -> str:
+    def _re_login(self, stale_key: Optional[str] = None) -> str:
         """Re-login after session expiration.
 
-        Clears the cached validation key and performs a new login.
+        Clears the cached validation key and performs a new login. Concurrent
+        callers are serialized, and a caller whose stale_key has already been
+        replaced by another thread's re-login reuses that key instead of
+        logging in again (which would invalidate the fresh session).
+
+        Args:
+            stale_key: The validation key the expired request was sent with
 
         Returns:
             Validation key string if login succeeds
@@ -241,14 +410,28 @@ class EMTClient:
         Raises:
             LoginFailedError: If re-login fails
         """
-        logger.info("Session expired, attempting to re-login...")
-        # Clear the cached validation key
-        self._em_validate_key = ""
-        # Re-login using stored username and environment variables
-        validate_key = self.login(self.username)
-        if validate_key is None:
-            raise LoginFailedError("Re-login failed after session expiration")
-        return validate_key
+        with self._login_lock:
+            if stale_key and self._em_validate_key and self._em_validate_key != stale_key:
+                return self._em_validate_key
+
+            logger.info("Session expired, attempting to re-login...")
+            # Clear the cached validation key
+            self._set_validate_key("")
+            # Re-login using stored username and environment variables
+            validate_key = self.login(self.username)
+            if validate_key is None:
+                raise LoginFailedError("Re-login failed after session expiration")
+            return validate_key
+
+    def logout(self) -> None:
+        """Drop the local session state.
+
+        Clears the validation key, the session cookies and the cached
+        encrypted passwords. The next query will trigger a fresh login.
+        """
+        self._set_validate_key("")
+        self.session.cookies.clear()
+        _encrypt_cached.cache_clear()
 
     def verify_session(self) -> bool:
         """Verify if the current session is still valid.
@@ -263,9 +446,10 @@ class EMTClient:
 
         try:
             # Use a lightweight query to verify session
-            resp = self._query_something("query_asset_and_pos")
-            return resp is not None
-        except (SessionExpiredError, EmAPIError, Exception):
+            self._query_something("query_asset_and_pos")
+            self._last_verified_at = time.monotonic()
+            return True
+        except (EmtlException, RequestException):
             return False
 
     def query_abbrs(self, *keys: str) -> dict:
@@ -283,12 +467,9 @@ class EMTClient:
             >>> client.query_abbrs("Zqdm", "Zqmc")
             {"Zqdm": {...}, "Zqmc": {...}}
         """
-        # Get the directory of this file to locate abbrs.json
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        abbrs_path = os.path.join(current_dir, "..", "..", "abbrs.json")
-
-        with open(abbrs_path, "r", encoding="utf-8") as f:
-            all_abbrs = json.load(f)
+        # Decoding the cached bytes is cheaper than deep-copying a cached parse,
+        # and every caller still gets its own mutable dicts
+        all_abbrs = json_loads(_abbrs_bytes())
 
         if not keys:
             return all_abbrs
@@ -301,10 +482,7 @@ class EMTClient:
         Returns:
             Dict containing asset and position data or None
         """
-        resp = self._query_something_with_retry("query_asset_and_pos")
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_asset_and_pos")
 
     def query_orders(self) -> Optional[dict]:
         """Query current orders.
@@ -312,10 +490,7 @@ class EMTClient:
         Returns:
             Dict containing orders data or None
         """
-        resp = self._query_something_with_retry("query_orders")
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_orders")
 
     def query_trades(self) -> Optional[dict]:
         """Query executed trades.
@@ -323,10 +498,7 @@ class EMTClient:
         Returns:
             Dict containing trades data or None
         """
-        resp = self._query_something_with_retry("query_trades")
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_trades")
 
     def query_history_orders(self, size: int, start_time: str, end_time: str) -> Optional[dict]:
         """Query historical orders.
@@ -340,10 +512,7 @@ class EMTClient:
             Dict containing historical orders data or None
         """
         req_data = {"qqhs": size, "dwc": "", "st": start_time, "et": end_time}
-        resp = self._query_something_with_retry("query_his_orders", req_data)
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_his_orders", req_data)
 
     def query_history_trades(self, size: int, start_time: str, end_time: str) -> Optional[dict]:
         """Query historical trades.
@@ -357,10 +526,7 @@ class EMTClient:
             Dict containing historical trades data or None
         """
         req_data = {"qqhs": size, "dwc": "", "st": start_time, "et": end_time}
-        resp = self._query_something_with_retry("query_his_trades", req_data)
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_his_trades", req_data)
 
     def query_funds_flow(self, size: int, start_time: str, end_time: str) -> Optional[dict]:
         """Query funds flow.
@@ -374,10 +540,7 @@ class EMTClient:
             Dict containing funds flow data or None
         """
         req_data = {"qqhs": size, "dwc": "", "st": start_time, "et": end_time}
-        resp = self._query_something_with_retry("query_funds_flow", req_data)
-        if resp:
-            return resp.json()
-        return None
+        return self._query_json("query_funds_flow", req_data)
 
     def create_order(self, stock_code: str, trade_type: str, market: str, price: float, amount: int) -> Optional[dict]:
         """Create a buy or sell order.
@@ -400,11 +563,9 @@ class EMTClient:
             "price": price,
             "amount": amount,
         }
-        resp = self._query_something_with_retry("create_order", req_data)
-        if resp:
-            logger.info(resp.json())
-            return resp.json()
-        return None
+        result = self._query_json("create_order", req_data)
+        logger.info(result)
+        return result
 
     def cancel_order(self, order_str: str) -> Optional[str]:
         """Cancel an order.
@@ -417,7 +578,5 @@ class EMTClient:
             Response text or None
         """
         data = {"revokes": order_str.strip()}
-        resp = self._query_something_with_retry("cancel_order", req_data=data)
-        if resp:
-            return resp.text.strip()
-        return None
+        resp, _ = self._query_something_with_retry("cancel_order", req_data=data)
+        return resp.text.strip()
@@ -5,9 +5,20 @@ including loading from cache, verifying session validity, and creating
 new instances when needed.
 """
 
+import asyncio
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from requests import RequestException
+
 from .client import EMTClient
+from .error import EmtlException
 from .error import LoginFailedError
 from .serializer import EMTClientSerializer
+from .serializer import SerializerError
 
 
 class ClientManager:
@@ -16,24 +27,64 @@ class ClientManager:
     The manager handles loading cached clients, verifying session validity,
     and creating new ones as needed. Session validity is verified on load
     rather than using time-based expiration.
+
+    Clients verified or logged in within the last verify_grace_seconds are
+    kept in memory and returned directly, skipping both the disk load and the
+    verification round-trip.
     """
 
-    def __init__(self, serializer: EMTClientSerializer):
+    def __init__(self, serializer: EMTClientSerializer, verify_grace_seconds: float = 300.0):
         """Initialize the client manager.
 
         Args:
             serializer: The serializer to use for persisting clients.
+            verify_grace_seconds: Seconds after its last successful verification or
+                login during which a client is served from memory without
+                re-verification (default 300, well under the server-side session
+                lifetime).
         """
         self.serializer = serializer
+        self.verify_grace_seconds = verify_grace_seconds
+        # username -> client; freshness is tracked by the client's own _last_verified_at
+        self._mem: dict[str, EMTClient] = {}
+        self._mem_lock = threading.Lock()
+        # Per-username locks so concurrent get_client calls for the same user
+        # share one load/verify/login while different users proceed in parallel
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, username: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(username)
+            if lock is None:
+                lock = self._locks[username] = threading.Lock()
+            return lock
+
+    def _cached(self, username: str) -> EMTClient | None:
+        """Return the in-memory client if it holds a key and was verified within verify_grace_seconds."""
+        with self._mem_lock:
+            client = self._mem.get(username)
+        if client is not None and client._em_validate_key and time.monotonic() - client._last_verified_at < self.verify_grace_seconds:
+            return client
+        return None
+
+    def _remember(self, username: str, client: EMTClient) -> None:
+        with self._mem_lock:
+            self._mem[username] = client
+
+    def _forget(self, username: str) -> None:
+        with self._mem_lock:
+            self._mem.pop(username, None)
 
     def get_client(self, username: str, password: str, max_retries: int = 3) -> EMTClient:
         """Get a client for the given username.
 
         This method will:
-        1. Try to load an existing cached client from the serializer.
-        2. Verify the session is valid using a lightweight API call.
-        3. If invalid or not found, create a new client, login, and save it.
-        4. Retry up to max_retries times if login/session verification fails.
+        1. Return the in-memory client if it was verified within verify_grace_seconds.
+        2. Try to load an existing cached client from the serializer.
+        3. Verify the session is valid using a lightweight API call.
+        4. If invalid or not found, login again (reusing the stale client if any) and save it.
+        5. Retry up to max_retries times if login/session verification fails.
 
         Args:
             username: The username for the client.
@@ -47,43 +98,146 @@ class ClientManager:
             SerializerError: If serialization operations fail.
             LoginFailedError: If login fails after all retries.
         """
-        for attempt in range(max_retries):
+        client = self._cached(username)
+        if client is not None:
+            return client
+
+        with self._lock_for(username):
+            # Another thread may have resolved this user while we were waiting
+            client = self._cached(username)
+            if client is not None:
+                return client
+            return self._load_or_login(username, password, max_retries)
+
+    def _load_or_login(self, username: str, password: str, max_retries: int) -> EMTClient:
+        """Load and verify a cached client, or log in a new one.
+
+        Must be called with the username's lock held.
+        """
+        client: EMTClient | None = None
+        last_error: Exception | None = None
+        for _ in range(max_retries):
             try:
                 # Try to load from cache
-                client = self.serializer.load(username)
+                cached = self.serializer.load(username)
+            except SerializerError:
+                # Unreadable cache entry: drop it and surface the error, retrying won't help
+                self._forget(username)
+                self.serializer.delete(username)
+                raise
 
-                if client is not None:
-                    # Verify session is still valid
-                    if client.verify_session():
-                        return client
-                    else:
-                        # Session expired, delete cached file
-                        self.serializer.delete(username)
+            if cached is not None:
+                # Verify session is still valid
+                if cached.verify_session():
+                    self._remember(username, cached)
+                    return cached
+                # Session expired, delete cached file
+                self._forget(username)
+                self.serializer.delete(username)
+                client = cached
 
-                # Create new client and login
+            # Reuse the stale (or previously failed) client so the login goes over its
+            # pooled keep-alive connections; only its cookies need to be reset
+            if client is None:
                 client = EMTClient()
-                print(1111, client)
-                validate_key = client.login(username, password)
+            else:
+                client.session.cookies.clear()
 
-                # Check if login succeeded
+            # Login; only API and network failures are retried,
+            # programming errors propagate immediately
+            try:
+                validate_key = client.login(username, password)
                 if validate_key is None:
                     raise LoginFailedError(f"Login failed for user '{username}'. Please check username, password, and captcha.")
+            except (EmtlException, RequestException) as e:
+                last_error = e
+                continue
 
-                # Save to serializer
-                self.serializer.save(client)
+            # Save to serializer
+            self.serializer.save(client)
+            self._remember(username, client)
+            return client
 
-                return client
+        # All attempts failed, clean up and raise
+        self._forget(username)
+        self.serializer.delete(username)
+        raise LoginFailedError(f"Failed to get client for '{username}' after {max_retries} attempts: {last_error}") from last_error
 
-            except (LoginFailedError, Exception) as e:
-                if attempt == max_retries - 1:
-                    # Last attempt failed, clean up and raise
-                    self.serializer.delete(username)
-                    raise LoginFailedError(f"Failed to get client for '{username}' after {max_retries} attempts: {e}") from e
-                # Retry
+    def get_clients(self, creds: Iterable[tuple[str, str]], max_workers: int = 8) -> list[EMTClient]:
+        """Get clients for several users concurrently.
 
-        # Should not reach here, but just in case
-        self.serializer.delete(username)
-        raise LoginFailedError(f"Failed to get client for '{username}' after {max_retries} attempts")
+        Each (username, password) pair is resolved with get_client on a
+        thread pool, so cache loads and logins of different users overlap.
+
+        Args:
+            creds: Iterable of (username, password) pairs.
+            max_workers: Maximum number of worker threads (default 8).
+
+        Returns:
+            List of authenticated EMTClient instances in the same order as creds.
+
+        Raises:
+            SerializerError: If serialization operations fail.
+            LoginFailedError: If login fails after all retries for any user.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda cred: self.get_client(*cred), creds))
+
+    async def get_client_async(self, username: str, password: str, max_retries: int = 3) -> EMTClient:
+        """Async variant of get_client.
+
+        The blocking load/verify/login work runs in the default thread pool,
+        so several users can be resolved concurrently from one event loop.
+
+        Args:
+            username: The username for the client.
+            password: The password for login (only used if creating new client).
+            max_retries: Maximum number of retry attempts (default 3).
+
+        Returns:
+            An authenticated EMTClient instance with valid session.
+        """
+        return await asyncio.to_thread(self.get_client, username, password, max_retries)
+
+    async def gather_queries(self, clients: Iterable[EMTClient], method_name: str, *args: Any, **kwargs: Any) -> list[Any]:
+        """Call the same EMTClient method on several clients concurrently.
+
+        Each call runs in the default thread pool, overlapping the network
+        round-trips of the individual clients.
+
+        Args:
+            clients: The clients to query.
+            method_name: Name of the EMTClient method, e.g. "query_asset_and_position".
+            *args: Positional arguments passed to each call.
+            **kwargs: Keyword arguments passed to each call.
+
+        Returns:
+            List of results in the same order as clients.
+        """
+        return await asyncio.gather(*(asyncio.to_thread(getattr(client, method_name), *args, **kwargs) for client in clients))
+
+    def verify_all(self, usernames: Iterable[str] | None = None, max_workers: int = 16) -> dict[str, bool]:
+        """Verify the cached sessions of several users concurrently.
+
+        Args:
+            usernames: Usernames to verify (defaults to all cached users).
+            max_workers: Maximum number of worker threads (default 16).
+
+        Returns:
+            Dict mapping each username to True if its cached session is valid.
+            Users whose cache entry cannot be read are reported as False.
+        """
+        users = list(usernames) if usernames is not None else self.list_cached_users()
+
+        def verify(username: str) -> bool:
+            try:
+                client = self.serializer.load(username)
+            except SerializerError:
+                return False
+            return client is not None and client.verify_session()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(users, executor.map(verify, users), strict=True))
 
     def invalidate(self, username: str) -> bool:
         """Invalidate a cached client by username.
@@ -94,6 +248,7 @@ class ClientManager:
         Returns:
             True if the client was deleted, False if not found.
         """
+        self._forget(username)
         return self.serializer.delete(username)
 
     def list_cached_users(self) -> list[str]:
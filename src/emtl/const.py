@@ -1,23 +1,46 @@
-"""EMT API constants."""
+"""EMT API constants.
 
-_urls: dict[str, str] = {
-    "yzm": "https://jywg.18.cn/Login/YZM?randNum=",
-    "login": "https://jywg.18.cn/Login/Authentication?validatekey=",
-    "query_asset_and_pos": "https://jywg.18.cn/Com/queryAssetAndPositionV1?validatekey=",
-    "query_orders": "https://jywg.18.cn/Search/GetOrdersData?validatekey=",
-    "query_trades": "https://jywg.18.cn/Search/GetDealData?validatekey=",
-    "query_his_orders": "https://jywg.18.cn/Search/GetHisOrdersData?validatekey=",
-    "query_his_trades": "https://jywg.18.cn/Search/GetHisDealData?validatekey=",
-    "query_funds_flow": "https://jywg.18.cn/Search/GetFundsFlow?validatekey=",
-    "query_positions": "https://jywg.18.cn/Search/GetStockList?validatekey=",
-    "create_order": "https://jywg.18.cn/Trade/SubmitTradeV2?validatekey=",
-    "cancel_order": "https://jywg.18.cn/Trade/RevokeOrders?validatekey=",
-}
+All tables are read-only views so they can be shared without defensive copies.
+"""
 
-_base_headers: dict[str, str] = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/114.0.0.0 Safari/537.36",
-    "Origin": "https://jywg.18.cn",
-    "Host": "jywg.18.cn",
-}
+from collections.abc import Mapping
+from types import MappingProxyType
 
+_urls: Mapping[str, str] = MappingProxyType(
+    {
+        "yzm": "https://jywg.18.cn/Login/YZM?randNum=",
+        "login": "https://jywg.18.cn/Login/Authentication?validatekey=",
+        "query_asset_and_pos": "https://jywg.18.cn/Com/queryAssetAndPositionV1?validatekey=",
+        "query_orders": "https://jywg.18.cn/Search/GetOrdersData?validatekey=",
+        "query_trades": "https://jywg.18.cn/Search/GetDealData?validatekey=",
+        "query_his_orders": "https://jywg.18.cn/Search/GetHisOrdersData?validatekey=",
+        "query_his_trades": "https://jywg.18.cn/Search/GetHisDealData?validatekey=",
+        "query_funds_flow": "https://jywg.18.cn/Search/GetFundsFlow?validatekey=",
+        "query_positions": "https://jywg.18.cn/Search/GetStockList?validatekey=",
+        "create_order": "https://jywg.18.cn/Trade/SubmitTradeV2?validatekey=",
+        "cancel_order": "https://jywg.18.cn/Trade/RevokeOrders?validatekey=",
+    }
+)
+
+_base_headers: Mapping[str, str] = MappingProxyType(
+    {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36",
+        "Origin": "https://jywg.18.cn",
+        "Host": "jywg.18.cn",
+    }
+)
+
+_xhr_headers: Mapping[str, str] = MappingProxyType(
+    {
+        "X-Requested-With": "XMLHttpRequest",
+    }
+)
+
+_login_headers: Mapping[str, str] = MappingProxyType(
+    {
+        "X-Requested-With": "XMLHttpRequest",
+        "Referer": "https://jywg.18.cn/Login?el=1&clear=&returl=%2fTrade%2fBuy",
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+)
@@ -6,13 +6,21 @@ time-based expiration.
 """
 
 import abc
+import bisect
 import os
+import pickle
+import tempfile
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Optional
 
-import dill
+if TYPE_CHECKING:
+    from .client import EMTClient
 
-from .client import EMTClient
+# One-byte format marker written in front of every serialized client
+_PICKLE_MARKER = b"P"
+_DILL_MARKER = b"D"
 
 
 class SerializerError(Exception):
@@ -29,7 +37,7 @@ class EMTClientSerializer(abc.ABC):
     """
 
     @abc.abstractmethod
-    def save(self, client: EMTClient) -> None:
+    def save(self, client: "EMTClient") -> None:
         """Save a client instance.
 
         Args:
@@ -41,7 +49,7 @@ class EMTClientSerializer(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def load(self, username: str) -> Optional[EMTClient]:
+    def load(self, username: str) -> Optional["EMTClient"]:
         """Load a client instance by username.
 
         Args:
@@ -81,10 +89,18 @@ class EMTClientSerializer(abc.ABC):
 
 
 class DillSerializer(EMTClientSerializer):
-    """Default implementation using dill for serialization.
+    """Default implementation using pickle, falling back to dill.
+
+    Clients are serialized with the stdlib pickle (protocol 5) and only
+    fall back to dill for objects pickle cannot handle. Files without a format
+    marker are treated as legacy dill files.
 
     Each client is saved as a separate file named after the username.
     Session validity is verified externally by the ClientManager.
+
+    The list of saved users is scanned once at construction and then kept
+    up to date by save and delete. Files added to the storage directory by
+    other processes show up after a new serializer is created.
     """
 
     def __init__(self, storage_dir: str | Path | None = None):
@@ -114,11 +130,23 @@ class DillSerializer(EMTClientSerializer):
         self.storage_dir = dir_path
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
+        # Sorted usernames, maintained on save/delete so list_users never walks the directory
+        self._users_lock = threading.Lock()
+        self._users = self._scan_users()
+
+    def _scan_users(self) -> list[str]:
+        """Return the sorted usernames found in the storage directory."""
+        # scandir yields the file type from the directory read itself, so no
+        # per-file stat is needed
+        with os.scandir(self.storage_dir) as entries:
+            users = [entry.name[: -len(".pkl")] for entry in entries if entry.name.endswith(".pkl") and entry.is_file()]
+        return sorted(users)
+
     def _get_file_path(self, username: str) -> Path:
         """Get the file path for a given username."""
         return self.storage_dir / f"{username}.pkl"
 
-    def save(self, client: EMTClient) -> None:
+    def save(self, client: "EMTClient") -> None:
         """Save a client instance.
 
         Args:
@@ -131,14 +159,46 @@ class DillSerializer(EMTClientSerializer):
             raise SerializerError("Cannot save client without username")
 
         file_path = self._get_file_path(client.username)
+        # Write to a uniquely named sibling file and rename it into place, so
+        # readers never observe a partially written cache entry and concurrent
+        # writers (threads or processes sharing the directory) never touch each
+        # other's temporary files
+        tmp_path: Path | None = None
 
         try:
-            with open(file_path, "wb") as f:
-                dill.dump(client, f)
+            try:
+                payload = _PICKLE_MARKER + pickle.dumps(client, protocol=5)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                import dill  # noqa: PLC0415 - deferred: only needed when pickle cannot handle the client
+
+                payload = _DILL_MARKER + dill.dumps(client)
+            fd, tmp_name = tempfile.mkstemp(dir=self.storage_dir, prefix=f"{client.username}.", suffix=".tmp")
+            tmp_path = Path(tmp_name)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                # Flush to disk before the rename so a power loss cannot leave
+                # the renamed file empty or truncated
+                f.flush()
+                os.fsync(f.fileno())
+            tmp_path.replace(file_path)
         except Exception as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
             raise SerializerError(f"Failed to save client: {e}") from e
 
-    def load(self, username: str) -> Optional[EMTClient]:
+        with self._users_lock:
+            index = bisect.bisect_left(self._users, client.username)
+            if index == len(self._users) or self._users[index] != client.username:
+                self._users.insert(index, client.username)
+
+    def _discard_user(self, username: str) -> None:
+        """Remove username from the in-memory user list if present."""
+        with self._users_lock:
+            index = bisect.bisect_left(self._users, username)
+            if index < len(self._users) and self._users[index] == username:
+                del self._users[index]
+
+    def load(self, username: str) -> Optional["EMTClient"]:
         """Load a client instance by username.
 
         Args:
@@ -152,12 +212,28 @@ class DillSerializer(EMTClientSerializer):
         """
         file_path = self._get_file_path(username)
 
-        if not file_path.exists():
+        try:
+            # One read for the whole file instead of the unpickler's many small reads
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Removed behind our back (another process or by hand)
+            self._discard_user(username)
             return None
+        except Exception as e:
+            raise SerializerError(f"Failed to load client: {e}") from e
 
         try:
-            with open(file_path, "rb") as f:
-                return dill.load(f)
+            marker, payload = data[:1], memoryview(data)[1:]
+            if marker == _PICKLE_MARKER:
+                return pickle.loads(payload)
+
+            import dill  # noqa: PLC0415 - deferred: only needed for dill-encoded or legacy files
+
+            if marker == _DILL_MARKER:
+                return dill.loads(payload)
+            # Files written before format markers were introduced are plain dill
+            return dill.loads(data)
         except Exception as e:
             raise SerializerError(f"Failed to load client: {e}") from e
 
@@ -172,22 +248,22 @@ class DillSerializer(EMTClientSerializer):
         """
         file_path = self._get_file_path(username)
 
-        if not file_path.exists():
-            return False
-
         try:
             file_path.unlink()
-            return True
+        except FileNotFoundError:
+            self._discard_user(username)
+            return False
         except Exception as e:
             raise SerializerError(f"Failed to delete client: {e}") from e
 
+        self._discard_user(username)
+        return True
+
     def list_users(self) -> list[str]:
         """List all usernames with saved clients.
 
         Returns:
             List of usernames.
         """
-        users = []
-        for file_path in self.storage_dir.glob("*.pkl"):
-            users.append(file_path.stem)
-        return sorted(users)
+        with self._users_lock:
+            return list(self._users)
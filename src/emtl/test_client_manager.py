@@ -0,0 +1,91 @@
+"""Tests for ClientManager's login retries, locking and in-memory cache."""
+
+import threading
+import time
+
+import pytest
+
+from .client import EMTClient
+from .client_manager import ClientManager
+from .error import EmAPIError
+from .error import LoginFailedError
+from .serializer import DillSerializer
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.delenv("EMTL_STORAGE_DIR", raising=False)
+    monkeypatch.setattr(EMTClient, "verify_session", lambda self: False)
+    return ClientManager(DillSerializer(tmp_path))
+
+
+def _patch_login(monkeypatch, side_effect=None, delay=0.0):
+    """Replace EMTClient.login with a stub and return the list of its calls."""
+    calls = []
+    lock = threading.Lock()
+
+    def login(self, username="", password="", duration=180, captcha=None):
+        with lock:
+            calls.append(username)
+        time.sleep(delay)
+        if side_effect is not None:
+            raise side_effect
+        self.username = username
+        self._set_validate_key(f"key{len(calls)}")
+        self._last_verified_at = time.monotonic()
+        return self._em_validate_key
+
+    monkeypatch.setattr(EMTClient, "login", login)
+    return calls
+
+
+def test_api_error_is_retried_then_raises_login_failed(manager, monkeypatch):
+    calls = _patch_login(monkeypatch, side_effect=EmAPIError("bad captcha"))
+
+    with pytest.raises(LoginFailedError):
+        manager.get_client("alice", "secret", max_retries=3)
+
+    assert len(calls) == 3
+    assert manager.list_cached_users() == []
+
+
+def test_non_api_error_propagates_after_one_attempt(manager, monkeypatch):
+    calls = _patch_login(monkeypatch, side_effect=ValueError("bug"))
+
+    with pytest.raises(ValueError, match="bug"):
+        manager.get_client("alice", "secret", max_retries=3)
+
+    assert len(calls) == 1
+
+
+def test_concurrent_callers_share_one_login(manager, monkeypatch):
+    calls = _patch_login(monkeypatch, delay=0.05)
+    results = []
+
+    def worker():
+        results.append(manager.get_client("alice", "secret"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(client is results[0] for client in results)
+
+
+def test_client_with_cleared_key_is_not_served_from_memory(manager, monkeypatch):
+    calls = _patch_login(monkeypatch)
+
+    client = manager.get_client("alice", "secret")
+    assert manager.get_client("alice", "secret") is client
+    assert len(calls) == 1
+
+    # A failed re-login leaves the key empty
+    client._set_validate_key("")
+
+    refreshed = manager.get_client("alice", "secret")
+    assert len(calls) == 2
+    assert refreshed._em_validate_key == "key2"
@@ -0,0 +1,82 @@
+"""Regression tests for the on-disk client cache format."""
+
+import dill
+import pytest
+from requests import Session
+
+from .client import EMTClient
+from .serializer import _DILL_MARKER
+from .serializer import _PICKLE_MARKER
+from .serializer import DillSerializer
+from .serializer import SerializerError
+
+
+@pytest.fixture
+def serializer(tmp_path, monkeypatch):
+    monkeypatch.delenv("EMTL_STORAGE_DIR", raising=False)
+    return DillSerializer(tmp_path)
+
+
+def _make_client(username: str, validate_key: str) -> EMTClient:
+    client = EMTClient()
+    client.username = username
+    client._set_validate_key(validate_key)
+    client.session.cookies.set("Khmc", "alice-cookie", domain="jywg.18.cn")
+    return client
+
+
+def test_round_trip_uses_pickle_marker(serializer):
+    serializer.save(_make_client("alice", "key123"))
+
+    assert serializer._get_file_path("alice").read_bytes()[:1] == _PICKLE_MARKER
+    assert serializer.list_users() == ["alice"]
+
+    loaded = serializer.load("alice")
+    assert loaded.username == "alice"
+    assert loaded._em_validate_key == "key123"
+    assert loaded._resolved_urls["query_orders"].endswith("key123")
+    assert loaded.session.cookies.get("Khmc", domain="jywg.18.cn") == "alice-cookie"
+    assert loaded._last_verified_at == 0.0
+
+
+def test_dill_marker_is_loaded(serializer):
+    client = _make_client("alice", "key123")
+    serializer._get_file_path("alice").write_bytes(_DILL_MARKER + dill.dumps(client))
+
+    loaded = serializer.load("alice")
+    assert loaded._em_validate_key == "key123"
+
+
+def test_legacy_unmarked_dill_file_is_loaded(serializer, monkeypatch):
+    session = Session()
+    session.cookies.set("Khmc", "legacy-cookie", domain="jywg.18.cn")
+    client = EMTClient()
+    # Before __getstate__ existed, dill pickled the whole instance dict without a marker
+    monkeypatch.setattr(EMTClient, "__getstate__", lambda self: {"session": session, "_em_validate_key": "oldkey", "username": "bob"})
+    serializer._get_file_path("bob").write_bytes(dill.dumps(client))
+    monkeypatch.undo()
+
+    loaded = serializer.load("bob")
+    assert isinstance(loaded, EMTClient)
+    assert loaded.username == "bob"
+    assert loaded._em_validate_key == "oldkey"
+    assert loaded._resolved_urls["query_orders"].endswith("oldkey")
+    assert loaded.session.cookies.get("Khmc", domain="jywg.18.cn") == "legacy-cookie"
+    # The legacy session object is replaced by one with the current adapter setup
+    assert loaded.session is not session
+
+
+@pytest.mark.parametrize("data", [_PICKLE_MARKER + b"not a pickle", _DILL_MARKER + b"\x80\x05garbage", b"garbage"])
+def test_corrupt_file_raises_serializer_error(serializer, data):
+    serializer._get_file_path("carol").write_bytes(data)
+
+    with pytest.raises(SerializerError):
+        serializer.load("carol")
+
+
+def test_missing_file_is_dropped_from_user_list(serializer):
+    serializer.save(_make_client("alice", "key123"))
+    serializer._get_file_path("alice").unlink()
+
+    assert serializer.load("alice") is None
+    assert serializer.list_users() == []
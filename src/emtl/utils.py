@@ -1,10 +1,18 @@
-import base64
 import logging
+from binascii import b2a_base64
+from codecs import BOM_UTF8
+from functools import lru_cache
+from typing import Any
 
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.asymmetric import rsa
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional, fall back to the stdlib decoder
+    from json import loads as _json_loads
+
 rsa_public_key = """
 -----BEGIN PUBLIC KEY-----
 MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDHdsyxT66pDG4p73yope7jxA92
@@ -14,6 +22,9 @@ c0AT4qIJ/xtbBcHkFPK77upnsfDTJiVEuQDH+MiMeb+XhCLNKZGp0yaUU6GlxZdp
 -----END PUBLIC KEY-----
 """
 
+# Parsed once at import; PEM/ASN.1 decoding never changes between calls
+_pub_key: rsa.RSAPublicKey = serialization.load_pem_public_key(rsa_public_key.encode("utf-8"))  # type:ignore
+
 
 def get_logger(name: str) -> logging.Logger:
     """Configure and return a logger instance.
@@ -30,6 +41,27 @@ def get_logger(name: str) -> logging.Logger:
     return logger
 
 
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON document from raw bytes.
+
+    Uses orjson when it is installed and the stdlib json module otherwise. A
+    leading UTF-8 BOM is stripped first, since orjson rejects it while the
+    stdlib decoder accepts it.
+
+    Args:
+        data: Raw JSON bytes, typically ``Response.content``
+
+    Returns:
+        The decoded JSON value
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if data[:3] == BOM_UTF8:
+        data = data[3:]
+    return _json_loads(data)
+
+
 def emt_trade_encrypt(content: str) -> str:
     """Encrypt content using RSA public key for EMT trading.
 
@@ -39,9 +71,24 @@ def emt_trade_encrypt(content: str) -> str:
     Returns:
         Base64 encoded encrypted string
     """
-    _pub_key: rsa.RSAPublicKey = serialization.load_pem_public_key(rsa_public_key.encode("utf-8"))  # type:ignore
     encrypt_text = _pub_key.encrypt(content.encode(), padding.PKCS1v15())
-    return base64.b64encode(encrypt_text).decode("utf-8")
+    return b2a_base64(encrypt_text, newline=False).decode("ascii")
+
+
+# Only for login passwords. Order payloads must go through emt_trade_encrypt so
+# each submission gets fresh PKCS1v15 padding. The cache lives in process memory
+# only and is cleared by EMTClient.logout().
+@lru_cache(maxsize=32)
+def _encrypt_cached(content: str) -> str:
+    """Encrypt content with emt_trade_encrypt, memoizing the result.
+
+    Args:
+        content: Plaintext content to encrypt
+
+    Returns:
+        Base64 encoded encrypted string
+    """
+    return emt_trade_encrypt(content)
 
 
 def get_float(data: dict, key: str) -> float:
@@ -54,9 +101,16 @@ def get_float(data: dict, key: str) -> float:
     Returns:
         Float value or 0.0 if value is empty
     """
-    if v := data[key].strip():
+    v = data[key]
+    if not v:
+        return 0.0
+    # float() already ignores surrounding whitespace, so only strip when it fails
+    try:
         return float(v)
-    return 0.0
+    except ValueError:
+        if v.strip():
+            raise
+        return 0.0
 
 
 def get_int(data: dict, key: str) -> int:
@@ -69,6 +123,13 @@ def get_int(data: dict, key: str) -> int:
     Returns:
         Integer value or 0 if value is empty
     """
-    if v := data[key].strip():
+    v = data[key]
+    if not v:
+        return 0
+    # int() already ignores surrounding whitespace, so only strip when it fails
+    try:
         return int(v)
-    return 0
+    except ValueError:
+        if v.strip():
+            raise
+        return 0